@@ -0,0 +1,260 @@
+"""
+Tiered decision cascade for DetectFraud.
+
+Each transaction runs through a list of tiers; the first tier that reaches
+a decision ends the cascade. Cheap tiers settle the clearly-safe and
+clearly-fraudulent traffic, so only the rest pays for customer-profile
+lookups and model inference in the terminal tier. A cheap tier only
+decides where the profile and model tiers could not reasonably disagree. The static banking limits
+(backend/config/fraud-rules.js) are not a tier: the backend enforces them
+and never calls DetectFraud for a violation.
+
+Every tier's calls, exits and time spent are recorded. A tier only sees
+the traffic the tiers before it let through, so those numbers depend on
+its position. To rank the cheap tiers fairly, one in SHADOW_SAMPLE_EVERY
+decisions also runs every cheap tier, and the last SAMPLE_WINDOW of these
+samples are kept. Every REORDER_INTERVAL decisions the cheap tiers are
+re-sorted greedily on them: next comes the tier with the lowest
+median cost / exit rate on the sampled transactions the tiers already
+placed let through, so the order follows the live traffic mix; the reported
+counters are plain totals. No two cheap tiers reach different verdicts for
+the same transaction, so reordering them changes cost but not results. The
+expensive tiers keep their position after them.
+"""
+import itertools
+import statistics
+import threading
+import time
+from collections import deque
+
+from scoring import FRAUD_THRESHOLD, rule_score, verdict
+
+SAFE_MAX_AMOUNT = 15000
+SAFE_MAX_TXN_1MIN = 2
+SAFE_MAX_AMOUNT_24HR = 50000
+SAFE_MAX_TXN_10MIN = 5
+PROFILE_MIN_HISTORY = 5
+PROFILE_FRAUD_ZSCORE = 3.0
+# Spread assumed for customers whose amounts barely vary, as a fraction of
+# their mean, so a small change to a near-constant amount is not a spike
+PROFILE_MIN_RELATIVE_STD = 0.25
+PROFILE_RISK = 0.85
+
+REORDER_INTERVAL = 1000
+SHADOW_SAMPLE_EVERY = 20
+SAMPLE_WINDOW = 500
+REORDER_MIN_SAMPLES = 20
+
+
+def rules_for(txn, context):
+    """Rule score and reasons, computed at most once per transaction"""
+    if 'rules' not in context:
+        context['rules'] = rule_score(txn)
+    return context['rules']
+
+
+class ObviouslySafeTier:
+    """Small, slow, low-risk everyday payments"""
+    name = 'obviously_safe'
+
+    def decide(self, txn, context):
+        if (txn.amount_value <= SAFE_MAX_AMOUNT
+                and txn.sender_amount_24hr <= SAFE_MAX_AMOUNT_24HR
+                and txn.sender_txn_count_1min <= SAFE_MAX_TXN_1MIN
+                and txn.sender_txn_count_10min <= SAFE_MAX_TXN_10MIN
+                and txn.ip_risk != 'HIGH'
+                and txn.merchant_risk_level != 'HIGH'):
+            return verdict(txn, 0.0, [])
+        return None
+
+
+class RuleFraudTier:
+    """
+    Rule score alone at or over the fraud threshold; that takes at least
+    three rules (e.g. a high amount from a high-risk IP at a high-risk
+    merchant), so the transaction is fraud whatever the model says
+    """
+    name = 'rules'
+
+    def decide(self, txn, context):
+        risk_score, reasons = rules_for(txn, context)
+        if risk_score >= FRAUD_THRESHOLD:
+            return verdict(txn, risk_score, reasons)
+        return None
+
+
+class ProfileTier:
+    """
+    Amount far outside the customer's own history (CustomerStateStore): at
+    least PROFILE_FRAUD_ZSCORE times the larger of the customer's standard
+    deviation and PROFILE_MIN_RELATIVE_STD of their mean above the mean.
+    """
+    name = 'profile'
+
+    def __init__(self, store):
+        self.store = store
+
+    def decide(self, txn, context):
+        profile = self.store.get(txn.sender_customer_id)
+        if profile is None or profile.txn_count < PROFILE_MIN_HISTORY or profile.amount_std == 0:
+            return None
+        deviation = txn.amount_value - profile.amount_mean
+        spread = max(profile.amount_std, PROFILE_MIN_RELATIVE_STD * profile.amount_mean)
+        if deviation < PROFILE_FRAUD_ZSCORE * spread:
+            return None
+        z_score = deviation / profile.amount_std
+        risk_score, reasons = rules_for(txn, context)
+        reasons = reasons + [
+            f'Amount ₹{txn.amount_value:.0f} is {z_score:.1f} std deviations from average ₹{profile.amount_mean:.0f}'
+        ]
+        return verdict(txn, max(risk_score, PROFILE_RISK), reasons)
+
+
+class FinalTier:
+    """Always decides: model probability if a model is loaded, rule score otherwise"""
+    name = 'final'
+
+    def __init__(self, model=None):
+        self.model = model
+        if model is not None:
+            self.name = 'model'
+
+    def decide(self, txn, context):
+        risk_score, reasons = rules_for(txn, context)
+        if self.model is not None:
+            risk_score = self.model.predict_request(txn)
+        return verdict(txn, risk_score, reasons)
+
+
+class TierStats:
+    __slots__ = ('calls', 'exits', 'fraud_exits', 'seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.exits = 0
+        self.fraud_exits = 0
+        self.seconds = 0.0
+
+
+class Cascade:
+    """
+    cheap_tiers are reordered from sampled stats; expensive_tiers and then
+    final_tier (which must always decide) run after them in fixed order.
+    """
+
+    def __init__(self, cheap_tiers, expensive_tiers, final_tier,
+                 reorder_interval=REORDER_INTERVAL, sample_every=SHADOW_SAMPLE_EVERY):
+        self._order = tuple(cheap_tiers)
+        self._tail = tuple(expensive_tiers) + (final_tier,)
+        self.reorder_interval = reorder_interval
+        self.sample_every = sample_every
+        self._stats = {tier.name: TierStats() for tier in self._order + self._tail}
+        # ({tier: seconds}, {tier: exited}) with every cheap tier run on the same transaction
+        self._samples = deque(maxlen=SAMPLE_WINDOW)
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        self._decisions = 0
+
+    @property
+    def order(self):
+        return [tier.name for tier in self._order + self._tail]
+
+    def decide(self, txn):
+        context = {}
+        sampled = self.sample_every and next(self._sequence) % self.sample_every == 0
+        order = self._order
+        timings = []
+        samples = []
+        result = None
+        exited = None
+        for tier in order:
+            if result is not None and not sampled:
+                break
+            start = time.perf_counter()
+            decision = tier.decide(txn, context)
+            seconds = time.perf_counter() - start
+            if sampled:
+                samples.append((tier.name, seconds, decision))
+            if result is None:
+                timings.append((tier.name, seconds))
+                if decision is not None:
+                    result, exited = decision, tier.name
+        if result is None:
+            for tier in self._tail:
+                start = time.perf_counter()
+                result = tier.decide(txn, context)
+                timings.append((tier.name, time.perf_counter() - start))
+                if result is not None:
+                    exited = tier.name
+                    break
+
+        with self._lock:
+            for name, seconds in timings:
+                stats = self._stats[name]
+                stats.calls += 1
+                stats.seconds += seconds
+            stats = self._stats[exited]
+            stats.exits += 1
+            stats.fraud_exits += result['is_fraud']
+            if samples:
+                self._samples.append((
+                    {name: seconds for name, seconds, _ in samples},
+                    {name: decision is not None for name, _, decision in samples},
+                ))
+            self._decisions += 1
+            reorder = self.reorder_interval and self._decisions % self.reorder_interval == 0
+
+        if reorder:
+            self.reorder()
+        return result
+
+    def _greedy_order(self):
+        # Median, so one preempted sample cannot reshuffle the order
+        costs = {tier.name: statistics.median(seconds[tier.name] for seconds, _ in self._samples)
+                 for tier in self._order}
+        remaining = [exited for _, exited in self._samples]
+        tiers = list(self._order)
+        order = []
+        while tiers:
+            def rank(tier):
+                exits = sum(exited[tier.name] for exited in remaining)
+                return costs[tier.name] / max(exits / max(len(remaining), 1), 1e-6)
+            best = min(tiers, key=rank)
+            tiers.remove(best)
+            order.append(best)
+            remaining = [exited for exited in remaining if not exited[best.name]]
+        return tuple(order)
+
+    def reorder(self):
+        """Sort the cheap tiers by sampled cost per decision"""
+        with self._lock:
+            previous = self._order
+            if len(self._samples) >= REORDER_MIN_SAMPLES:
+                self._order = self._greedy_order()
+        if self._order != previous:
+            print(f"🪜 Cascade order: {' → '.join(self.order)}")
+
+    def stats(self):
+        """Per-tier totals, hit rates and timings since the cascade was built, in the current order"""
+        with self._lock:
+            report = []
+            for name in self.order:
+                stats = self._stats[name]
+                calls = stats.calls or 1
+                report.append({
+                    'tier': name,
+                    'calls': stats.calls,
+                    'exit_rate': stats.exits / calls,
+                    'fraud_exit_rate': stats.fraud_exits / calls,
+                    'mean_us': stats.seconds / calls * 1e6,
+                })
+            return report
+
+
+def build_cascade(store, model=None):
+    """Default tier set; initial order is cheapest first and re-tuned from live stats"""
+    return Cascade(
+        [ObviouslySafeTier(), RuleFraudTier()],
+        [ProfileTier(store)],
+        FinalTier(model)
+    )
@@ -0,0 +1,130 @@
+import math
+import threading
+import time
+from datetime import datetime
+
+
+def parse_timestamp(value):
+    """Convert an ISO-8601 transaction timestamp to epoch seconds (now if unparseable)"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return time.time()
+
+
+class CustomerProfile:
+    """Running amount statistics for one sender_customer_id"""
+
+    __slots__ = ('txn_count', 'amount_sum', 'amount_sq_sum', 'amount_max', 'last_seen')
+
+    def __init__(self, txn_count=0, amount_sum=0.0, amount_sq_sum=0.0, amount_max=0.0, last_seen=0.0):
+        self.txn_count = txn_count
+        self.amount_sum = amount_sum
+        self.amount_sq_sum = amount_sq_sum
+        self.amount_max = amount_max
+        self.last_seen = last_seen
+
+    @property
+    def amount_mean(self):
+        return self.amount_sum / self.txn_count if self.txn_count else 0.0
+
+    @property
+    def amount_std(self):
+        if self.txn_count < 2:
+            return 0.0
+        mean = self.amount_mean
+        return math.sqrt(max(self.amount_sq_sum / self.txn_count - mean * mean, 0.0))
+
+    def add(self, amount, timestamp):
+        self.txn_count += 1
+        self.amount_sum += amount
+        self.amount_sq_sum += amount * amount
+        self.amount_max = max(self.amount_max, amount)
+        self.last_seen = max(self.last_seen, timestamp)
+
+    def copy(self):
+        return CustomerProfile(self.txn_count, self.amount_sum, self.amount_sq_sum,
+                               self.amount_max, self.last_seen)
+
+
+class CustomerStateStore:
+    """
+    Process-local per-customer state of a scoring worker.
+
+    Only correct when every transaction of a customer reaches the same
+    process, which is what the shard router in sharding.py guarantees.
+    """
+
+    def __init__(self):
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._journal = None
+
+    def attach_journal(self, journal):
+        """
+        Report every mutation to journal (see state_persistence.py).
+
+        journal.upsert/delete are called while the store lock is held, so
+        the journal sees mutations in the order they were applied.
+        """
+        with self._lock:
+            self._journal = journal
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def get(self, customer_id):
+        """Return a copy of the customer's profile, or None if never seen"""
+        with self._lock:
+            profile = self._profiles.get(customer_id)
+            return profile.copy() if profile else None
+
+    def record(self, request):
+        """Fold a scored TransactionRequest into its sender's profile"""
+        timestamp = parse_timestamp(request.transaction_timestamp)
+        with self._lock:
+            profile = self._profiles.get(request.sender_customer_id)
+            if profile is None:
+                profile = self._profiles[request.sender_customer_id] = CustomerProfile()
+            profile.add(request.amount_value, timestamp)
+            if self._journal:
+                self._journal.upsert(request.sender_customer_id, profile)
+
+    def select(self, predicate):
+        """Return copies of (customer_id, profile) pairs whose id matches predicate"""
+        with self._lock:
+            return [(customer_id, profile.copy())
+                    for customer_id, profile in self._profiles.items()
+                    if predicate(customer_id)]
+
+    def drop(self, predicate):
+        """Remove customers whose id matches predicate, returning how many went"""
+        with self._lock:
+            doomed = [customer_id for customer_id in self._profiles if predicate(customer_id)]
+            for customer_id in doomed:
+                del self._profiles[customer_id]
+                if self._journal:
+                    self._journal.delete(customer_id)
+            return len(doomed)
+
+    def load(self, items):
+        """Install (customer_id, profile) pairs, replacing any existing entries"""
+        count = 0
+        with self._lock:
+            for customer_id, profile in items:
+                self._profiles[customer_id] = profile
+                if self._journal:
+                    self._journal.upsert(customer_id, profile)
+                count += 1
+        return count
+
+    def checkpoint(self, mark=None):
+        """
+        Return (mark(), copies of all (customer_id, profile) pairs).
+
+        mark runs under the store lock, so its result describes exactly the
+        state that was copied.
+        """
+        with self._lock:
+            token = mark() if mark else None
+            return token, [(customer_id, profile.copy()) for customer_id, profile in self._profiles.items()]
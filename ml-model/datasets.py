@@ -0,0 +1,100 @@
+"""
+Loading of the labeled transaction CSVs in "Data Sample".
+
+The generated files (main.py / generate_data.py) store categoricals as
+integer codes while others (fraud_transactions1.csv) use the strings the
+backend sends over gRPC. Both are decoded here into TransactionRequest-
+shaped NumPy columns with the gRPC strings.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Vocabulary of each categorical field, in the order of the integer codes
+# used by the generated CSVs (see "Data Sample/main.py")
+CATEGORIES = {
+    'transaction_type': ['TRANSFER', 'PAYMENT'],
+    'sender_account_type': ['SAVINGS', 'CURRENT'],
+    'sender_kyc_status': ['MIN_KYC', 'FULL_KYC'],
+    'device_type': ['MOBILE', 'WEB'],
+    'device_os': ['Android', 'iOS', 'Windows'],
+    'ip_risk': ['LOW', 'MEDIUM', 'HIGH'],
+    'receiver_type': ['PERSON', 'MERCHANT'],
+    'merchant_category': ['FOOD', 'ELECTRONICS', 'TRAVEL', 'HEALTH',
+                          'UTILITIES', 'ENTERTAINMENT', 'SHOPPING', 'EDUCATION'],
+    'merchant_risk_level': ['LOW', 'MEDIUM', 'HIGH'],
+    'payment_method': ['UPI', 'CARD', 'NETBANKING'],
+    'authorization_type': ['PIN', 'OTP', 'BIOMETRIC'],
+}
+
+NUMERIC_FIELDS = {
+    'amount_value': np.float64,
+    'sender_account_age_days': np.int64,
+    'sender_txn_count_1min': np.int64,
+    'sender_txn_count_10min': np.int64,
+    'sender_amount_24hr': np.float64,
+}
+
+STRING_FIELDS = [
+    'transaction_id', 'transaction_timestamp', 'amount_currency',
+    'sender_customer_id', 'sender_account_id', 'sender_state', 'sender_city',
+    'app_version', 'receiver_bank',
+] + list(CATEGORIES)
+
+REQUIRED_COLUMNS = list(NUMERIC_FIELDS) + STRING_FIELDS + ['is_fraud']
+
+REASON_LABELS = [
+    'fraud_reason_unusual_amount',
+    'fraud_reason_geo_distance_anomaly',
+    'fraud_reason_high_velocity',
+]
+
+
+def _to_bool(series):
+    if series.dtype == bool:
+        return series.to_numpy()
+    return series.astype(str).str.strip().str.lower().isin(['1', '1.0', 'true']).to_numpy()
+
+
+def _decode_categorical(name, series):
+    if pd.api.types.is_numeric_dtype(series):
+        vocabulary = np.array(CATEGORIES[name] + [''], dtype=object)
+        codes = series.fillna(-1).astype(np.int64).to_numpy()
+        codes = np.where((codes >= 0) & (codes < len(CATEGORIES[name])), codes, len(CATEGORIES[name]))
+        return vocabulary[codes]
+    return series.fillna('').astype(str).to_numpy(dtype=object)
+
+
+def load_labeled_csv(path):
+    """
+    Return (columns, labels): TransactionRequest-shaped column arrays and boolean label arrays.
+
+    Raises ValueError naming the columns the CSV is missing.
+    """
+    frame = pd.read_csv(path)
+    missing = [name for name in REQUIRED_COLUMNS if name not in frame]
+    if missing:
+        raise ValueError(f'{path} is missing required columns: {", ".join(missing)}')
+    columns = SimpleNamespace()
+    for name, dtype in NUMERIC_FIELDS.items():
+        setattr(columns, name, pd.to_numeric(frame[name], errors='coerce').fillna(0).to_numpy(dtype=dtype))
+    for name in STRING_FIELDS:
+        if name in CATEGORIES:
+            setattr(columns, name, _decode_categorical(name, frame[name]))
+        else:
+            setattr(columns, name, frame[name].fillna('').astype(str).to_numpy(dtype=object))
+
+    labels = {'is_fraud': _to_bool(frame['is_fraud'])}
+    for name in REASON_LABELS:
+        labels[name] = _to_bool(frame[name]) if name in frame else np.zeros(len(frame), dtype=bool)
+    return columns, labels
+
+
+def write_labeled_csv(path, columns, labels, rows=None):
+    """Write columns and labels (as returned by load_labeled_csv) back to a CSV, optionally only rows"""
+    rows = slice(None) if rows is None else rows
+    frame = pd.DataFrame({name: values[rows] for name, values in vars(columns).items()})
+    for name, values in labels.items():
+        frame[name] = values[rows]
+    frame.to_csv(path, index=False)
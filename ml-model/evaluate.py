@@ -0,0 +1,253 @@
+"""
+Offline evaluation of the fraud scoring logic against labeled data.
+
+Scores a labeled CSV (e.g. "Data Sample/fraud_transactions.csv") with the
+rules (or trained model) alone, in one vectorized pass, and reports
+precision/recall, ROC and PR AUC, a confusion matrix per fraud reason, a
+full threshold sweep and the scoring throughput of the run. DetectFraud
+answers through the decision cascade instead, whose cheap tiers override
+the model for part of the traffic; --cascade replays the file through it
+and reports what the server would actually return.
+
+Usage:
+    python evaluate.py "../Data Sample/fraud_transactions.csv" --sweep-out sweep.csv
+    python evaluate.py --model-dir model    # the rows train.py held out
+"""
+import argparse
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from cascade import build_cascade
+from customer_state import CustomerStateStore
+from datasets import load_labeled_csv
+from fraud_model import HOLDOUT_FILE, FraudModel
+from scoring import FRAUD_THRESHOLD, score_batch, score_transaction
+
+# Ground-truth label column -> scoring output it is compared against
+REASONS = {
+    'fraud_reason_unusual_amount': 'unusual_amount',
+    'fraud_reason_geo_distance_anomaly': 'geo_anomaly',
+    'fraud_reason_high_velocity': 'high_velocity',
+}
+
+
+def confusion(predicted, actual):
+    return {
+        'tp': int(np.count_nonzero(predicted & actual)),
+        'fp': int(np.count_nonzero(predicted & ~actual)),
+        'fn': int(np.count_nonzero(~predicted & actual)),
+        'tn': int(np.count_nonzero(~predicted & ~actual)),
+    }
+
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator else 0.0
+
+
+def threshold_sweep(scores, actual):
+    """
+    Confusion counts at every distinct score threshold from a single sort.
+
+    Row i of the result describes flagging every transaction with
+    risk_score >= thresholds[i]; thresholds are in descending order.
+    """
+    order = np.argsort(-scores, kind='stable')
+    sorted_scores = scores[order]
+    sorted_actual = actual[order]
+
+    tp = np.cumsum(sorted_actual)
+    fp = np.cumsum(~sorted_actual)
+    # Last position of each run of equal scores
+    last = np.flatnonzero(np.r_[sorted_scores[1:] != sorted_scores[:-1], True])
+
+    tp, fp = tp[last], fp[last]
+    positives = int(np.count_nonzero(actual))
+    negatives = len(actual) - positives
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 1.0)
+        recall = tp / positives if positives else np.zeros(len(tp))
+        fpr = fp / negatives if negatives else np.zeros(len(fp))
+
+    return {
+        'thresholds': sorted_scores[last],
+        'tp': tp,
+        'fp': fp,
+        'fn': positives - tp,
+        'tn': negatives - fp,
+        'precision': precision,
+        'recall': recall,
+        'fpr': fpr,
+    }
+
+
+def roc_auc(sweep):
+    fpr = np.r_[0.0, sweep['fpr']]
+    tpr = np.r_[0.0, sweep['recall']]
+    return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+
+def pr_auc(sweep):
+    """Average precision: precision weighted by each step in recall"""
+    recall = np.r_[0.0, sweep['recall']]
+    return float(np.sum(np.diff(recall) * sweep['precision']))
+
+
+def row_records(columns):
+    """One TransactionRequest-like object per row of a column table"""
+    fields = vars(columns)
+    return [SimpleNamespace(**{name: values[i] for name, values in fields.items()})
+            for i in range(len(columns.amount_value))]
+
+
+def measure_throughput(columns, repeat, model=None):
+    """Rows per second for the vectorized batch path and the per-request path"""
+    rows = len(columns.amount_value)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        score_batch(columns, model)
+    batch_seconds = (time.perf_counter() - start) / repeat
+
+    records = row_records(columns)
+    start = time.perf_counter()
+    for record in records:
+        score_transaction(record, model)
+    row_seconds = time.perf_counter() - start
+
+    return {
+        'batch_rows_per_sec': _ratio(rows, batch_seconds),
+        'row_rows_per_sec': _ratio(rows, row_seconds),
+        'row_latency_us': _ratio(row_seconds, rows) * 1e6,
+    }
+
+
+def evaluate_cascade(columns, labels, threshold=FRAUD_THRESHOLD, model=None):
+    """
+    Replay the file through the server's decision cascade in row order,
+    building customer profiles as it goes, and report its quality, speed
+    and per-tier stats.
+    """
+    store = CustomerStateStore()
+    cascade = build_cascade(store, model)
+    records = row_records(columns)
+
+    risk_score = np.empty(len(records))
+    start = time.perf_counter()
+    for i, record in enumerate(records):
+        risk_score[i] = cascade.decide(record)['risk_score']
+        store.record(record)
+    seconds = time.perf_counter() - start
+
+    matrix = confusion(risk_score >= threshold, labels['is_fraud'])
+    sweep = threshold_sweep(risk_score, labels['is_fraud'])
+    return {
+        'confusion': matrix,
+        'roc_auc': roc_auc(sweep),
+        'pr_auc': pr_auc(sweep),
+        'precision': _ratio(matrix['tp'], matrix['tp'] + matrix['fp']),
+        'recall': _ratio(matrix['tp'], matrix['tp'] + matrix['fn']),
+        'rows_per_sec': _ratio(len(records), seconds),
+        'tiers': cascade.stats(),
+    }
+
+
+def evaluate(columns, labels, threshold=FRAUD_THRESHOLD, repeat=20, model=None):
+    scores = score_batch(columns, model)
+    actual = labels['is_fraud']
+    predicted = scores['risk_score'] >= threshold
+    matrix = confusion(predicted, actual)
+    sweep = threshold_sweep(scores['risk_score'], actual)
+
+    return {
+        'rows': len(actual),
+        'fraud_rows': int(np.count_nonzero(actual)),
+        'threshold': threshold,
+        'model': model is not None,
+        'confusion': matrix,
+        'precision': _ratio(matrix['tp'], matrix['tp'] + matrix['fp']),
+        'recall': _ratio(matrix['tp'], matrix['tp'] + matrix['fn']),
+        'roc_auc': roc_auc(sweep),
+        'pr_auc': pr_auc(sweep),
+        'reasons': {name: confusion(scores[output], labels[name]) for name, output in REASONS.items()},
+        'sweep': sweep,
+        'throughput': measure_throughput(columns, repeat, model),
+    }
+
+
+def print_report(path, report):
+    m = report['confusion']
+    print(f"\n📊 Evaluation of {path}")
+    print(f"   Rows: {report['rows']} ({report['fraud_rows']} fraud)")
+    print(f"\n🎯 {'Model' if report['model'] else 'Rules'} alone (score_batch, no cascade) "
+          f"at threshold {report['threshold']:.2f}")
+    print(f"   Precision: {report['precision']:.3f}   Recall: {report['recall']:.3f}")
+    print(f"   TP: {m['tp']}  FP: {m['fp']}  FN: {m['fn']}  TN: {m['tn']}")
+    print(f"   ROC AUC: {report['roc_auc']:.3f}   PR AUC: {report['pr_auc']:.3f}")
+
+    print("\n🔎 Per-reason confusion (TP / FP / FN / TN)")
+    for name, r in report['reasons'].items():
+        print(f"   {name:<36} {r['tp']:>5} / {r['fp']:>5} / {r['fn']:>5} / {r['tn']:>5}")
+
+    sweep = report['sweep']
+    print("\n📈 Threshold sweep")
+    print(f"   {'threshold':>9} {'precision':>9} {'recall':>7} {'fpr':>7}")
+    for i in range(len(sweep['thresholds'])):
+        print(f"   {sweep['thresholds'][i]:>9.3f} {sweep['precision'][i]:>9.3f} "
+              f"{sweep['recall'][i]:>7.3f} {sweep['fpr'][i]:>7.3f}")
+
+    t = report['throughput']
+    print("\n⚡ Throughput")
+    print(f"   Vectorized batch: {t['batch_rows_per_sec']:,.0f} rows/sec")
+    print(f"   Per request:      {t['row_rows_per_sec']:,.0f} rows/sec ({t['row_latency_us']:.1f} µs/row)")
+
+    c = report.get('cascade')
+    if c:
+        m = c['confusion']
+        print("\n🪜 Decision cascade (what DetectFraud returns)")
+        print(f"   Precision: {c['precision']:.3f}   Recall: {c['recall']:.3f}   {c['rows_per_sec']:,.0f} rows/sec")
+        print(f"   TP: {m['tp']}  FP: {m['fp']}  FN: {m['fn']}  TN: {m['tn']}")
+        print(f"   ROC AUC: {c['roc_auc']:.3f}   PR AUC: {c['pr_auc']:.3f}")
+        print(f"   {'tier':<16} {'calls':>7} {'exit':>7} {'fraud':>7} {'µs/call':>8}")
+        for tier in c['tiers']:
+            print(f"   {tier['tier']:<16} {tier['calls']:>7.0f} {tier['exit_rate']:>7.1%} "
+                  f"{tier['fraud_exit_rate']:>7.1%} {tier['mean_us']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate fraud scoring against a labeled CSV')
+    parser.add_argument('csv', nargs='?',
+                        help='Labeled transactions CSV with is_fraud and fraud_reason_* columns '
+                             '(default with --model-dir: the holdout.csv train.py wrote there)')
+    parser.add_argument('--threshold', type=float, default=FRAUD_THRESHOLD)
+    parser.add_argument('--repeat', type=int, default=20, help='Batch scoring repetitions for timing')
+    parser.add_argument('--sweep-out', help='Write the full threshold sweep to this CSV')
+    parser.add_argument('--model-dir', help='Score with a model written by train.py instead of the rules')
+    parser.add_argument('--cascade', action='store_true',
+                        help="Also replay the rows through the server's decision cascade")
+    args = parser.parse_args()
+    if args.csv is None:
+        if not args.model_dir:
+            parser.error('a CSV is required without --model-dir')
+        args.csv = os.path.join(args.model_dir, HOLDOUT_FILE)
+
+    model = FraudModel.load(args.model_dir) if args.model_dir else None
+    try:
+        columns, labels = load_labeled_csv(args.csv)
+    except ValueError as e:
+        parser.error(str(e))
+    report = evaluate(columns, labels, threshold=args.threshold, repeat=args.repeat, model=model)
+    if args.cascade:
+        report['cascade'] = evaluate_cascade(columns, labels, threshold=args.threshold, model=model)
+    print_report(args.csv, report)
+
+    if args.sweep_out:
+        pd.DataFrame(report['sweep']).to_csv(args.sweep_out, index=False)
+        print(f"\n💾 Threshold sweep written to {args.sweep_out}")
+
+
+if __name__ == '__main__':
+    main()
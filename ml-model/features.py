@@ -0,0 +1,92 @@
+"""
+Feature encoding shared by training, batch scoring and the gRPC server.
+
+FeatureEncoder is compiled once from its spec into per-field slots: numeric
+fields are copied as-is, categoricals go through a precomputed
+{string: code} lookup table (unknown values become NaN, which the tree
+models route as missing). Numeric clipping uses fixed lower/upper arrays.
+
+encode_request and encode_batch fill a matrix with the same raw values and
+then run the very same _finish step on it, so the online and offline
+encodings cannot drift apart.
+"""
+import json
+
+import numpy as np
+
+from datasets import CATEGORIES
+
+# (field, lower bound, upper bound) applied by np.clip; None is unbounded
+NUMERIC_FEATURES = [
+    ('amount_value', 0.0, None),
+    ('sender_account_age_days', 0.0, None),
+    ('sender_txn_count_1min', 0.0, None),
+    ('sender_txn_count_10min', 0.0, None),
+    ('sender_amount_24hr', 0.0, None),
+]
+
+
+class FeatureEncoder:
+    def __init__(self, numeric=NUMERIC_FEATURES, categorical=CATEGORIES):
+        self.numeric = [tuple(spec) for spec in numeric]
+        self.categorical = {field: list(vocabulary) for field, vocabulary in categorical.items()}
+        self.feature_names = [field for field, _, _ in self.numeric] + list(self.categorical)
+
+        self._numeric_slots = [(i, field) for i, (field, _, _) in enumerate(self.numeric)]
+        self._categorical_slots = [
+            (len(self.numeric) + i, field, {value: float(code) for code, value in enumerate(vocabulary)})
+            for i, (field, vocabulary) in enumerate(self.categorical.items())
+        ]
+        self._lower = np.array([-np.inf if lower is None else lower for _, lower, _ in self.numeric])
+        self._upper = np.array([np.inf if upper is None else upper for _, _, upper in self.numeric])
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def new_buffer(self, rows=1):
+        return np.empty((rows, self.n_features))
+
+    def encode_request(self, request, out=None):
+        """Encode one TransactionRequest into out, a preallocated (1, n_features) buffer"""
+        if out is None:
+            out = self.new_buffer()
+        row = out[0]
+        for i, field in self._numeric_slots:
+            row[i] = getattr(request, field)
+        for i, field, table in self._categorical_slots:
+            row[i] = table.get(getattr(request, field), np.nan)
+        return self._finish(out)
+
+    def encode_batch(self, columns):
+        """Encode a column table (one array per TransactionRequest field) into a feature matrix"""
+        out = self.new_buffer(len(getattr(columns, self.numeric[0][0])))
+        for i, field in self._numeric_slots:
+            out[:, i] = getattr(columns, field)
+        for i, field, table in self._categorical_slots:
+            out[:, i] = [table.get(value, np.nan) for value in getattr(columns, field)]
+        return self._finish(out)
+
+    def _finish(self, out):
+        numeric = out[:, :len(self.numeric)]
+        np.clip(numeric, self._lower, self._upper, out=numeric)
+        return out
+
+    def to_dict(self):
+        return {
+            'numeric': [[field, lower, upper] for field, lower, upper in self.numeric],
+            'categorical': self.categorical,
+        }
+
+    @classmethod
+    def from_dict(cls, spec):
+        return cls(numeric=spec['numeric'], categorical=spec['categorical'])
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
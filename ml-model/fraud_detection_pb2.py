@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x15\x66raud_detection.proto\x12\x0f\x66raud_detection\"\x92\x05\n\x12TransactionRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\t\x12\x18\n\x10transaction_type\x18\x02 \x01(\t\x12\x1d\n\x15transaction_timestamp\x18\x03 \x01(\t\x12\x14\n\x0c\x61mount_value\x18\x04 \x01(\x01\x12\x17\n\x0f\x61mount_currency\x18\x05 \x01(\t\x12\x1a\n\x12sender_customer_id\x18\x06 \x01(\t\x12\x19\n\x11sender_account_id\x18\x07 \x01(\t\x12\x1b\n\x13sender_account_type\x18\x08 \x01(\t\x12\x19\n\x11sender_kyc_status\x18\t \x01(\t\x12\x1f\n\x17sender_account_age_days\x18\n \x01(\x05\x12\x14\n\x0csender_state\x18\x0b \x01(\t\x12\x13\n\x0bsender_city\x18\x0c \x01(\t\x12\x1d\n\x15sender_txn_count_1min\x18\r \x01(\x05\x12\x1e\n\x16sender_txn_count_10min\x18\x0e \x01(\x05\x12\x1a\n\x12sender_amount_24hr\x18\x0f \x01(\x01\x12\x13\n\x0b\x64\x65vice_type\x18\x10 \x01(\t\x12\x11\n\tdevice_os\x18\x11 \x01(\t\x12\x13\n\x0b\x61pp_version\x18\x12 \x01(\t\x12\x0f\n\x07ip_risk\x18\x13 \x01(\t\x12\x15\n\rreceiver_type\x18\x14 \x01(\t\x12\x15\n\rreceiver_bank\x18\x15 \x01(\t\x12\x19\n\x11merchant_category\x18\x16 \x01(\t\x12\x1b\n\x13merchant_risk_level\x18\x17 \x01(\t\x12\x16\n\x0epayment_method\x18\x18 \x01(\t\x12\x1a\n\x12\x61uthorization_type\x18\x19 \x01(\t\"\xee\x01\n\rFraudResponse\x12\x10\n\x08is_fraud\x18\x01 \x01(\x08\x12\x12\n\nrisk_score\x18\x02 \x01(\x01\x12#\n\x1b\x66raud_reason_unusual_amount\x18\x03 \x01(\x08\x12)\n!fraud_reason_geo_distance_anomaly\x18\x04 \x01(\x08\x12\"\n\x1a\x66raud_reason_high_velocity\x18\x05 \x01(\x08\x12\x16\n\x0e\x66raud_severity\x18\x06 \x01(\t\x12\x12\n\nflag_color\x18\x07 \x01(\t\x12\x17\n\x0freason_of_fraud\x18\x08 \x01(\t2k\n\x15\x46raudDetectionService\x12R\n\x0b\x44\x65tectFraud\x12#.fraud_detection.TransactionRequest\x1a\x1e.fraud_detection.FraudResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x15\x66raud_detection.proto\x12\x0f\x66raud_detection\"\x92\x05\n\x12TransactionRequest\x12\x16\n\x0etransaction_id\x18\x01 \x01(\t\x12\x18\n\x10transaction_type\x18\x02 \x01(\t\x12\x1d\n\x15transaction_timestamp\x18\x03 \x01(\t\x12\x14\n\x0c\x61mount_value\x18\x04 \x01(\x01\x12\x17\n\x0f\x61mount_currency\x18\x05 \x01(\t\x12\x1a\n\x12sender_customer_id\x18\x06 \x01(\t\x12\x19\n\x11sender_account_id\x18\x07 \x01(\t\x12\x1b\n\x13sender_account_type\x18\x08 \x01(\t\x12\x19\n\x11sender_kyc_status\x18\t \x01(\t\x12\x1f\n\x17sender_account_age_days\x18\n \x01(\x05\x12\x14\n\x0csender_state\x18\x0b \x01(\t\x12\x13\n\x0bsender_city\x18\x0c \x01(\t\x12\x1d\n\x15sender_txn_count_1min\x18\r \x01(\x05\x12\x1e\n\x16sender_txn_count_10min\x18\x0e \x01(\x05\x12\x1a\n\x12sender_amount_24hr\x18\x0f \x01(\x01\x12\x13\n\x0b\x64\x65vice_type\x18\x10 \x01(\t\x12\x11\n\tdevice_os\x18\x11 \x01(\t\x12\x13\n\x0b\x61pp_version\x18\x12 \x01(\t\x12\x0f\n\x07ip_risk\x18\x13 \x01(\t\x12\x15\n\rreceiver_type\x18\x14 \x01(\t\x12\x15\n\rreceiver_bank\x18\x15 \x01(\t\x12\x19\n\x11merchant_category\x18\x16 \x01(\t\x12\x1b\n\x13merchant_risk_level\x18\x17 \x01(\t\x12\x16\n\x0epayment_method\x18\x18 \x01(\t\x12\x1a\n\x12\x61uthorization_type\x18\x19 \x01(\t\"\xee\x01\n\rFraudResponse\x12\x10\n\x08is_fraud\x18\x01 \x01(\x08\x12\x12\n\nrisk_score\x18\x02 \x01(\x01\x12#\n\x1b\x66raud_reason_unusual_amount\x18\x03 \x01(\x08\x12)\n!fraud_reason_geo_distance_anomaly\x18\x04 \x01(\x08\x12\"\n\x1a\x66raud_reason_high_velocity\x18\x05 \x01(\x08\x12\x16\n\x0e\x66raud_severity\x18\x06 \x01(\t\x12\x12\n\nflag_color\x18\x07 \x01(\t\x12\x17\n\x0freason_of_fraud\x18\x08 \x01(\t\"\x89\x01\n\rCustomerState\x12\x13\n\x0b\x63ustomer_id\x18\x01 \x01(\t\x12\x11\n\ttxn_count\x18\x02 \x01(\x03\x12\x12\n\namount_sum\x18\x03 \x01(\x01\x12\x15\n\ramount_sq_sum\x18\x04 \x01(\x01\x12\x12\n\namount_max\x18\x05 \x01(\x01\x12\x11\n\tlast_seen\x18\x06 \x01(\x01\"\'\n\tHashRange\x12\r\n\x05start\x18\x01 \x01(\x04\x12\x0b\n\x03\x65nd\x18\x02 \x01(\x04\"?\n\x11StateRangeRequest\x12*\n\x06ranges\x18\x01 \x03(\x0b\x32\x1a.fraud_detection.HashRange\"<\n\nStateBatch\x12.\n\x06states\x18\x01 \x03(\x0b\x32\x1e.fraud_detection.CustomerState\"\x19\n\x08StateAck\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\" \n\rWorkerRequest\x12\x0f\n\x07\x61\x64\x64ress\x18\x01 \x01(\t\"=\n\x11RebalanceResponse\x12\x17\n\x0fmoved_customers\x18\x01 \x01(\x05\x12\x0f\n\x07workers\x18\x02 \x03(\t2k\n\x15\x46raudDetectionService\x12R\n\x0b\x44\x65tectFraud\x12#.fraud_detection.TransactionRequest\x1a\x1e.fraud_detection.FraudResponse2\xf6\x01\n\x11ShardStateService\x12N\n\x0b\x45xportState\x12\".fraud_detection.StateRangeRequest\x1a\x1b.fraud_detection.StateBatch\x12\x45\n\x0bImportState\x12\x1b.fraud_detection.StateBatch\x1a\x19.fraud_detection.StateAck\x12J\n\tDropState\x12\".fraud_detection.StateRangeRequest\x1a\x19.fraud_detection.StateAck2\xb9\x01\n\x12ShardRouterService\x12O\n\tAddWorker\x12\x1e.fraud_detection.WorkerRequest\x1a\".fraud_detection.RebalanceResponse\x12R\n\x0cRemoveWorker\x12\x1e.fraud_detection.WorkerRequest\x1a\".fraud_detection.RebalanceResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,6 +35,24 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_TRANSACTIONREQUEST']._serialized_end=701
   _globals['_FRAUDRESPONSE']._serialized_start=704
   _globals['_FRAUDRESPONSE']._serialized_end=942
-  _globals['_FRAUDDETECTIONSERVICE']._serialized_start=944
-  _globals['_FRAUDDETECTIONSERVICE']._serialized_end=1051
+  _globals['_CUSTOMERSTATE']._serialized_start=945
+  _globals['_CUSTOMERSTATE']._serialized_end=1082
+  _globals['_HASHRANGE']._serialized_start=1084
+  _globals['_HASHRANGE']._serialized_end=1123
+  _globals['_STATERANGEREQUEST']._serialized_start=1125
+  _globals['_STATERANGEREQUEST']._serialized_end=1188
+  _globals['_STATEBATCH']._serialized_start=1190
+  _globals['_STATEBATCH']._serialized_end=1250
+  _globals['_STATEACK']._serialized_start=1252
+  _globals['_STATEACK']._serialized_end=1277
+  _globals['_WORKERREQUEST']._serialized_start=1279
+  _globals['_WORKERREQUEST']._serialized_end=1311
+  _globals['_REBALANCERESPONSE']._serialized_start=1313
+  _globals['_REBALANCERESPONSE']._serialized_end=1374
+  _globals['_FRAUDDETECTIONSERVICE']._serialized_start=1376
+  _globals['_FRAUDDETECTIONSERVICE']._serialized_end=1483
+  _globals['_SHARDSTATESERVICE']._serialized_start=1486
+  _globals['_SHARDSTATESERVICE']._serialized_end=1732
+  _globals['_SHARDROUTERSERVICE']._serialized_start=1735
+  _globals['_SHARDROUTERSERVICE']._serialized_end=1920
 # @@protoc_insertion_point(module_scope)
@@ -95,3 +95,285 @@ class FraudDetectionService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+
+class ShardStateServiceStub(object):
+    """Served by every scoring worker in a sharded deployment so the router can
+    hand per-customer state over when the hash ring changes.
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ExportState = channel.unary_unary(
+                '/fraud_detection.ShardStateService/ExportState',
+                request_serializer=fraud__detection__pb2.StateRangeRequest.SerializeToString,
+                response_deserializer=fraud__detection__pb2.StateBatch.FromString,
+                _registered_method=True)
+        self.ImportState = channel.unary_unary(
+                '/fraud_detection.ShardStateService/ImportState',
+                request_serializer=fraud__detection__pb2.StateBatch.SerializeToString,
+                response_deserializer=fraud__detection__pb2.StateAck.FromString,
+                _registered_method=True)
+        self.DropState = channel.unary_unary(
+                '/fraud_detection.ShardStateService/DropState',
+                request_serializer=fraud__detection__pb2.StateRangeRequest.SerializeToString,
+                response_deserializer=fraud__detection__pb2.StateAck.FromString,
+                _registered_method=True)
+
+
+class ShardStateServiceServicer(object):
+    """Served by every scoring worker in a sharded deployment so the router can
+    hand per-customer state over when the hash ring changes.
+    """
+
+    def ExportState(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ImportState(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DropState(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_ShardStateServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ExportState': grpc.unary_unary_rpc_method_handler(
+                    servicer.ExportState,
+                    request_deserializer=fraud__detection__pb2.StateRangeRequest.FromString,
+                    response_serializer=fraud__detection__pb2.StateBatch.SerializeToString,
+            ),
+            'ImportState': grpc.unary_unary_rpc_method_handler(
+                    servicer.ImportState,
+                    request_deserializer=fraud__detection__pb2.StateBatch.FromString,
+                    response_serializer=fraud__detection__pb2.StateAck.SerializeToString,
+            ),
+            'DropState': grpc.unary_unary_rpc_method_handler(
+                    servicer.DropState,
+                    request_deserializer=fraud__detection__pb2.StateRangeRequest.FromString,
+                    response_serializer=fraud__detection__pb2.StateAck.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'fraud_detection.ShardStateService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('fraud_detection.ShardStateService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class ShardStateService(object):
+    """Served by every scoring worker in a sharded deployment so the router can
+    hand per-customer state over when the hash ring changes.
+    """
+
+    @staticmethod
+    def ExportState(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/fraud_detection.ShardStateService/ExportState',
+            fraud__detection__pb2.StateRangeRequest.SerializeToString,
+            fraud__detection__pb2.StateBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ImportState(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/fraud_detection.ShardStateService/ImportState',
+            fraud__detection__pb2.StateBatch.SerializeToString,
+            fraud__detection__pb2.StateAck.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DropState(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/fraud_detection.ShardStateService/DropState',
+            fraud__detection__pb2.StateRangeRequest.SerializeToString,
+            fraud__detection__pb2.StateAck.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+
+class ShardRouterServiceStub(object):
+    """Served by the shard router for workers joining or leaving the ring.
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.AddWorker = channel.unary_unary(
+                '/fraud_detection.ShardRouterService/AddWorker',
+                request_serializer=fraud__detection__pb2.WorkerRequest.SerializeToString,
+                response_deserializer=fraud__detection__pb2.RebalanceResponse.FromString,
+                _registered_method=True)
+        self.RemoveWorker = channel.unary_unary(
+                '/fraud_detection.ShardRouterService/RemoveWorker',
+                request_serializer=fraud__detection__pb2.WorkerRequest.SerializeToString,
+                response_deserializer=fraud__detection__pb2.RebalanceResponse.FromString,
+                _registered_method=True)
+
+
+class ShardRouterServiceServicer(object):
+    """Served by the shard router for workers joining or leaving the ring.
+    """
+
+    def AddWorker(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RemoveWorker(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_ShardRouterServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'AddWorker': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddWorker,
+                    request_deserializer=fraud__detection__pb2.WorkerRequest.FromString,
+                    response_serializer=fraud__detection__pb2.RebalanceResponse.SerializeToString,
+            ),
+            'RemoveWorker': grpc.unary_unary_rpc_method_handler(
+                    servicer.RemoveWorker,
+                    request_deserializer=fraud__detection__pb2.WorkerRequest.FromString,
+                    response_serializer=fraud__detection__pb2.RebalanceResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'fraud_detection.ShardRouterService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('fraud_detection.ShardRouterService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class ShardRouterService(object):
+    """Served by the shard router for workers joining or leaving the ring.
+    """
+
+    @staticmethod
+    def AddWorker(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/fraud_detection.ShardRouterService/AddWorker',
+            fraud__detection__pb2.WorkerRequest.SerializeToString,
+            fraud__detection__pb2.RebalanceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RemoveWorker(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/fraud_detection.ShardRouterService/RemoveWorker',
+            fraud__detection__pb2.WorkerRequest.SerializeToString,
+            fraud__detection__pb2.RebalanceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,49 @@
+"""
+Trained fraud model: a FeatureEncoder paired with the TreeEnsemble it was
+trained against, saved and loaded together from one directory.
+"""
+import os
+import threading
+
+from features import FeatureEncoder
+from tree_ensemble import TreeEnsemble
+
+MODEL_FILE = 'fraud_model.npz'
+ENCODER_FILE = 'fraud_encoder.json'
+# Rows train.py kept out of training, for out-of-sample evaluation
+HOLDOUT_FILE = 'holdout.csv'
+
+
+class FraudModel:
+    def __init__(self, encoder, ensemble):
+        if encoder.n_features != ensemble.n_features:
+            raise ValueError(
+                f'Encoder produces {encoder.n_features} features but the model expects {ensemble.n_features}'
+            )
+        self.encoder = encoder
+        self.ensemble = ensemble
+        # One encoding buffer per gRPC worker thread
+        self._local = threading.local()
+
+    def predict_request(self, request):
+        """Fraud probability for one TransactionRequest"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = self.encoder.new_buffer()
+        return float(self.ensemble.predict_risk(self.encoder.encode_request(request, buffer))[0])
+
+    def predict_columns(self, columns):
+        """Fraud probabilities for a column table (see datasets.load_labeled_csv)"""
+        return self.ensemble.predict_risk(self.encoder.encode_batch(columns))
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.encoder.save(os.path.join(directory, ENCODER_FILE))
+        self.ensemble.save(os.path.join(directory, MODEL_FILE))
+
+    @classmethod
+    def load(cls, directory):
+        return cls(
+            FeatureEncoder.load(os.path.join(directory, ENCODER_FILE)),
+            TreeEnsemble.load(os.path.join(directory, MODEL_FILE))
+        )
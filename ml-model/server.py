@@ -1,14 +1,30 @@
+import argparse
 import grpc
 from concurrent import futures
 import fraud_detection_pb2
 import fraud_detection_pb2_grpc
+from cascade import build_cascade
+from customer_state import CustomerStateStore
+from fraud_model import FraudModel
+from sharding import ShardStateService, serve_router
+from state_persistence import StatePersistence
 
 class FraudDetectionService(fraud_detection_pb2_grpc.FraudDetectionServiceServicer):
+    def __init__(self, model=None):
+        # Trained FraudModel (see train.py); rules only when None
+        self.model = model
+        # Per-customer state; only consistent when run behind the shard router
+        # or as a single process
+        self.customer_state = CustomerStateStore()
+        # Cheap tiers exit early; only ambiguous transactions reach the model
+        self.cascade = build_cascade(self.customer_state, model)
+
     def DetectFraud(self, request, context):
         print(f"Received transaction: {request.transaction_id}")
         
         # PLACEHOLDER: ML model prediction
         prediction = self.predict_fraud(request)
+        self.customer_state.record(request)
         
         return fraud_detection_pb2.FraudResponse(
             is_fraud=prediction['is_fraud'],
@@ -23,57 +39,56 @@ class FraudDetectionService(fraud_detection_pb2_grpc.FraudDetectionServiceServic
     
     def predict_fraud(self, request):
         """
-        PLACEHOLDER: Replace with actual ML model
-        
-        This is where you would:
-        1. Load your trained ML model
-        2. Extract features from the request
-        3. Make predictions
-        4. Return fraud detection results
+        Run the request through the decision cascade (cascade.py).
+
+        The final tier scores with the trained model from --model-dir, or
+        with the placeholder rules in scoring.py when none is loaded.
         """
-        risk_score = 0.0
-        reasons = []
-        
-        # Simple rule-based logic for demonstration
-        if request.amount_value > 50000:
-            risk_score += 0.3
-            reasons.append('High transaction amount')
-        
-        if request.sender_txn_count_1min >= 5:
-            risk_score += 0.4
-            reasons.append('High transaction velocity')
-        
-        if request.ip_risk == 'HIGH':
-            risk_score += 0.3
-            reasons.append('High IP risk')
-        
-        if request.merchant_risk_level == 'HIGH':
-            risk_score += 0.2
-            reasons.append('High-risk merchant')
-            
-        is_fraud = risk_score >= 0.65
-        
-        return {
-            'is_fraud': is_fraud,
-            'risk_score': min(risk_score, 1.0),
-            'unusual_amount': request.amount_value > 50000,
-            'geo_anomaly': False,
-            'high_velocity': request.sender_txn_count_1min >= 5,
-            'severity': 'HIGH' if risk_score >= 0.8 else ('MEDIUM' if risk_score >= 0.5 else 'LOW'),
-            'flag_color': 'RED' if is_fraud else 'GREEN',
-            'reason': '; '.join(reasons) if reasons else 'No fraud detected by ML model'
-        }
+        return self.cascade.decide(request)
 
-def serve():
+def serve(port=50051, state_dir=None, model_dir=None):
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    fraud_detection_pb2_grpc.add_FraudDetectionServiceServicer_to_server(
-        FraudDetectionService(), server
+    model = None
+    if model_dir:
+        model = FraudModel.load(model_dir)
+        print(f"🧠 Loaded model with {model.ensemble.n_trees} trees from {model_dir}")
+    service = FraudDetectionService(model)
+    persistence = None
+    if state_dir:
+        persistence = StatePersistence(service.customer_state, state_dir)
+        persistence.recover()
+        persistence.start()
+    fraud_detection_pb2_grpc.add_FraudDetectionServiceServicer_to_server(service, server)
+    fraud_detection_pb2_grpc.add_ShardStateServiceServicer_to_server(
+        ShardStateService(service.customer_state), server
     )
-    server.add_insecure_port('[::]:50051')
+    server.add_insecure_port(f'[::]:{port}')
     server.start()
-    print("✅ gRPC ML server started on port 50051")
+    print(f"✅ gRPC ML server started on port {port}")
     print("📊 Waiting for fraud detection requests...")
-    server.wait_for_termination()
+    try:
+        server.wait_for_termination()
+    finally:
+        server.stop(grace=2).wait()
+        if persistence:
+            persistence.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Fraud detection gRPC ML server')
+    parser.add_argument('--port', type=int, default=50051)
+    parser.add_argument('--router', action='store_true',
+                        help='Run as shard router in front of --workers instead of scoring')
+    parser.add_argument('--workers', default='',
+                        help='Comma-separated host:port list of scoring workers (router mode)')
+    parser.add_argument('--state-dir', default=None,
+                        help='Directory for state snapshots and write-ahead log (disabled if omitted)')
+    parser.add_argument('--model-dir', default=None,
+                        help='Directory written by train.py (placeholder rules if omitted)')
+    return parser.parse_args()
 
 if __name__ == '__main__':
-    serve()
+    args = parse_args()
+    if args.router:
+        serve_router([w.strip() for w in args.workers.split(',') if w.strip()], port=args.port)
+    else:
+        serve(port=args.port, state_dir=args.state_dir, model_dir=args.model_dir)
@@ -0,0 +1,337 @@
+"""
+Customer-sharded deployment of the ML server.
+
+A ShardRouter listens where the backend expects the ML server and forwards
+every DetectFraud call to the scoring worker that owns the transaction's
+sender_customer_id on a consistent hash ring. Workers joining or leaving
+only move the customers on the arcs that changed owner, and the router
+copies their state to the new owner before switching the ring over.
+"""
+import bisect
+import hashlib
+import threading
+from concurrent import futures
+
+import grpc
+
+import fraud_detection_pb2
+import fraud_detection_pb2_grpc
+from customer_state import CustomerProfile
+
+DEFAULT_REPLICAS = 64
+FORWARD_TIMEOUT_SECONDS = 5.0
+UNREACHABLE_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+
+def customer_hash(customer_id):
+    """Position of a customer (or ring point) on the 64-bit hash ring"""
+    digest = hashlib.blake2b(customer_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class HashRing:
+    """
+    Immutable consistent hash ring with virtual nodes.
+
+    Each ring point owns the arc (previous point, point]. with_node and
+    without_node return new rings so the router can swap them atomically.
+    """
+
+    def __init__(self, nodes=(), replicas=DEFAULT_REPLICAS):
+        self.replicas = replicas
+        self.nodes = frozenset(nodes)
+        points = sorted(
+            (customer_hash(f'{node}#{i}'), node)
+            for node in self.nodes
+            for i in range(replicas)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def owner_of_hash(self, value):
+        if not self._points:
+            raise LookupError('Hash ring has no workers')
+        index = bisect.bisect_left(self._points, value)
+        return self._owners[index % len(self._owners)]
+
+    def node_for(self, customer_id):
+        return self.owner_of_hash(customer_hash(customer_id))
+
+    def with_node(self, node):
+        if node in self.nodes:
+            raise ValueError(f'Worker {node} is already on the ring')
+        return HashRing(self.nodes | {node}, self.replicas)
+
+    def without_node(self, node):
+        if node not in self.nodes:
+            raise ValueError(f'Worker {node} is not on the ring')
+        return HashRing(self.nodes - {node}, self.replicas)
+
+    def moved_ranges(self, new_ring):
+        """
+        Arcs whose owner differs between this ring and new_ring.
+
+        Returns {(old_owner, new_owner): [(start, end), ...]} using the same
+        (start, end] convention as HashRange.
+        """
+        boundaries = sorted(set(self._points) | set(new_ring._points))
+        moves = {}
+        if not self._points or not new_ring._points:
+            return moves
+        previous = boundaries[-1]
+        for boundary in boundaries:
+            source = self.owner_of_hash(boundary)
+            target = new_ring.owner_of_hash(boundary)
+            if source != target:
+                moves.setdefault((source, target), []).append((previous, boundary))
+            previous = boundary
+        return moves
+
+
+class RangeIndex:
+    """Membership test of a hash against a list of (start, end] ring arcs"""
+
+    def __init__(self, ranges):
+        spans = []
+        for start, end in ranges:
+            if start < end:
+                spans.append((start + 1, end))
+            else:
+                # Wrapping arc (including the whole ring when start == end)
+                spans.append((start + 1, 2 ** 64 - 1))
+                spans.append((0, end))
+        spans.sort()
+        self._starts = [start for start, _ in spans]
+        self._ends = [end for _, end in spans]
+
+    def __contains__(self, value):
+        index = bisect.bisect_right(self._starts, value) - 1
+        return index >= 0 and value <= self._ends[index]
+
+    def matches_customer(self, customer_id):
+        return customer_hash(customer_id) in self
+
+
+def profile_to_proto(customer_id, profile):
+    return fraud_detection_pb2.CustomerState(
+        customer_id=customer_id,
+        txn_count=profile.txn_count,
+        amount_sum=profile.amount_sum,
+        amount_sq_sum=profile.amount_sq_sum,
+        amount_max=profile.amount_max,
+        last_seen=profile.last_seen
+    )
+
+
+def profile_from_proto(state):
+    return state.customer_id, CustomerProfile(
+        state.txn_count, state.amount_sum, state.amount_sq_sum,
+        state.amount_max, state.last_seen
+    )
+
+
+def ranges_from_proto(request):
+    return RangeIndex((r.start, r.end) for r in request.ranges)
+
+
+class ShardStateService(fraud_detection_pb2_grpc.ShardStateServiceServicer):
+    """Worker side of state transfer, backed by the worker's CustomerStateStore"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def ExportState(self, request, context):
+        index = ranges_from_proto(request)
+        states = [profile_to_proto(customer_id, profile)
+                  for customer_id, profile in self.store.select(index.matches_customer)]
+        return fraud_detection_pb2.StateBatch(states=states)
+
+    def ImportState(self, request, context):
+        count = self.store.load(profile_from_proto(state) for state in request.states)
+        return fraud_detection_pb2.StateAck(count=count)
+
+    def DropState(self, request, context):
+        index = ranges_from_proto(request)
+        return fraud_detection_pb2.StateAck(count=self.store.drop(index.matches_customer))
+
+
+class WorkerClient:
+    def __init__(self, address):
+        self.address = address
+        self.channel = grpc.insecure_channel(address)
+        self.detect = fraud_detection_pb2_grpc.FraudDetectionServiceStub(self.channel)
+        self.state = fraud_detection_pb2_grpc.ShardStateServiceStub(self.channel)
+
+    def close(self):
+        self.channel.close()
+
+
+def range_request(ranges):
+    return fraud_detection_pb2.StateRangeRequest(
+        ranges=[fraud_detection_pb2.HashRange(start=start, end=end) for start, end in ranges]
+    )
+
+
+class ShardRouter(fraud_detection_pb2_grpc.FraudDetectionServiceServicer,
+                  fraud_detection_pb2_grpc.ShardRouterServiceServicer):
+    """
+    Routes DetectFraud to the worker owning sender_customer_id.
+
+    Rebalancing pauses requests for the customers on the moving arcs, waits
+    for their in-flight ones to finish, copies them to their new owners,
+    swaps the ring and only then drops the copies from the old owners, so no
+    update is lost. Customers outside the moving arcs keep being scored
+    throughout. If a transfer fails, the copies already imported are dropped
+    from their targets and the ring is left as it was.
+    """
+
+    def __init__(self, workers=(), replicas=DEFAULT_REPLICAS, timeout=FORWARD_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._ring = HashRing(workers, replicas)
+        self._clients = {address: WorkerClient(address) for address in self._ring.nodes}
+        self._admin_lock = threading.Lock()
+        self._gate = threading.Condition()
+        self._moving = None
+        self._inflight = {}
+
+    @property
+    def workers(self):
+        return sorted(self._ring.nodes)
+
+    def DetectFraud(self, request, context):
+        position = customer_hash(request.sender_customer_id)
+        with self._gate:
+            while self._moving is not None and position in self._moving:
+                self._gate.wait()
+            self._inflight[position] = self._inflight.get(position, 0) + 1
+            ring = self._ring
+        try:
+            try:
+                worker = ring.owner_of_hash(position)
+            except LookupError:
+                context.abort(grpc.StatusCode.UNAVAILABLE, 'No scoring workers registered')
+            try:
+                return self._clients[worker].detect.DetectFraud(request, timeout=self.timeout)
+            except grpc.RpcError as e:
+                context.abort(e.code(), f'Worker {worker} failed: {e.details()}')
+        finally:
+            with self._gate:
+                if self._inflight[position] == 1:
+                    del self._inflight[position]
+                    if self._moving is not None:
+                        self._gate.notify_all()
+                else:
+                    self._inflight[position] -= 1
+
+    def AddWorker(self, request, context):
+        return self._admin(self.add_worker, request, context)
+
+    def RemoveWorker(self, request, context):
+        return self._admin(self.remove_worker, request, context)
+
+    def _admin(self, action, request, context):
+        try:
+            moved = action(request.address)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except grpc.RpcError as e:
+            context.abort(grpc.StatusCode.UNAVAILABLE, f'State transfer failed: {e.details()}')
+        return fraud_detection_pb2.RebalanceResponse(moved_customers=moved, workers=self.workers)
+
+    def add_worker(self, address):
+        """Put a worker on the ring, moving it the customers it now owns"""
+        with self._admin_lock:
+            new_ring = self._ring.with_node(address)
+            self._clients[address] = WorkerClient(address)
+            try:
+                return self._rebalance(new_ring)
+            except Exception:
+                self._clients.pop(address).close()
+                raise
+
+    def remove_worker(self, address):
+        """
+        Take a worker off the ring after handing its customers to the remaining workers.
+
+        If the worker is unreachable (crashed), its customers' state is lost
+        and the ring is switched over without a transfer.
+        """
+        with self._admin_lock:
+            new_ring = self._ring.without_node(address)
+            if not new_ring.nodes:
+                raise ValueError('Cannot remove the last worker')
+            moved = self._rebalance(new_ring, departing=address)
+            self._clients.pop(address).close()
+            return moved
+
+    def _rebalance(self, new_ring, departing=None):
+        moves = self._ring.moved_ranges(new_ring)
+        moved = 0
+        exported = set()
+        lost = set()
+        imported = []
+        self._pause(RangeIndex(r for ranges in moves.values() for r in ranges))
+        try:
+            for (source, target), ranges in moves.items():
+                if source in lost:
+                    continue
+                try:
+                    batch = self._clients[source].state.ExportState(range_request(ranges), timeout=self.timeout)
+                except grpc.RpcError as e:
+                    if source != departing or e.code() not in UNREACHABLE_CODES:
+                        raise
+                    print(f"⚠️ Worker {source} unreachable ({e.code().name}); "
+                          f"state of its customers is lost")
+                    lost.add(source)
+                    continue
+                exported.add(source)
+                self._clients[target].state.ImportState(batch, timeout=self.timeout)
+                imported.append((target, ranges))
+                moved += len(batch.states)
+            self._ring = new_ring
+        except grpc.RpcError:
+            for target, ranges in imported:
+                self._drop(target, ranges)
+            raise
+        finally:
+            self._resume()
+
+        for (source, _), ranges in moves.items():
+            if source in exported:
+                self._drop(source, ranges)
+        print(f"🔀 Rebalanced {moved} customers across {len(new_ring)} workers")
+        return moved
+
+    def _drop(self, address, ranges):
+        """Best-effort DropState; the ring no longer routes these ranges here, so failures are only logged"""
+        try:
+            self._clients[address].state.DropState(range_request(ranges), timeout=self.timeout)
+        except grpc.RpcError as e:
+            print(f"⚠️ Could not drop {len(ranges)} ranges from worker {address}: {e.code().name}")
+
+    def _pause(self, moving):
+        """Hold new requests for hashes in moving and wait for in-flight ones to finish"""
+        with self._gate:
+            self._moving = moving
+            while any(position in moving for position in self._inflight):
+                self._gate.wait()
+
+    def _resume(self):
+        with self._gate:
+            self._moving = None
+            self._gate.notify_all()
+
+
+def serve_router(workers, port=50051, replicas=DEFAULT_REPLICAS):
+    router = ShardRouter(workers, replicas)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    fraud_detection_pb2_grpc.add_FraudDetectionServiceServicer_to_server(router, server)
+    fraud_detection_pb2_grpc.add_ShardRouterServiceServicer_to_server(router, server)
+    server.add_insecure_port(f'[::]:{port}')
+    server.start()
+    print(f"✅ gRPC shard router started on port {port}")
+    print(f"🔀 Routing by sender_customer_id across {len(router.workers)} workers: {', '.join(router.workers)}")
+    server.wait_for_termination()
@@ -0,0 +1,362 @@
+"""
+Crash recovery for the in-memory CustomerStateStore.
+
+State is persisted as a compact binary snapshot plus an append-only
+write-ahead log (WAL) of every mutation since that snapshot:
+
+  <state_dir>/state.snapshot     header, fixed-width profile records, id blob
+  <state_dir>/wal-000001.log     CRC-framed upsert/delete entries
+
+WAL entries are buffered in memory and written + fsynced in batches by a
+background thread, so a crash loses at most WAL_FLUSH_INTERVAL_SECONDS of
+mutations. A failed write is logged and retried with the entries kept in
+their segment. Each snapshot rotates the WAL to a new segment and deletes the
+segments it covers. Recovery memory-maps the snapshot and replays the
+remaining segments, without touching the backend database.
+"""
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+
+from customer_state import CustomerProfile
+
+SNAPSHOT_FILE = 'state.snapshot'
+SNAPSHOT_MAGIC = b'FRDSNAP1'
+SNAPSHOT_INTERVAL_SECONDS = 300
+WAL_FLUSH_INTERVAL_SECONDS = 0.05
+WAL_BATCH_SIZE = 512
+WAL_RETRY_SECONDS = 1.0
+
+# magic, record count, first WAL segment not covered by the snapshot, id blob size
+_SNAPSHOT_HEADER = struct.Struct('<8sIQQ')
+# id offset, id length, txn_count, amount_sum, amount_sq_sum, amount_max, last_seen
+_SNAPSHOT_RECORD = struct.Struct('<IIqdddd')
+# crc32 of the rest of the entry, op, id length
+_WAL_HEADER = struct.Struct('<IBH')
+_WAL_PROFILE = struct.Struct('<qdddd')
+_WAL_UPSERT = 1
+_WAL_DELETE = 2
+_WAL_SEGMENT = re.compile(r'^wal-(\d+)\.log$')
+
+
+def _profile_fields(profile):
+    return (profile.txn_count, profile.amount_sum, profile.amount_sq_sum,
+            profile.amount_max, profile.last_seen)
+
+
+def _fsync_directory(directory):
+    if os.name == 'nt':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_snapshot(path, items, wal_segment):
+    """Atomically write (customer_id, profile) items as a binary snapshot"""
+    records = bytearray()
+    ids = bytearray()
+    count = 0
+    for customer_id, profile in items:
+        encoded = customer_id.encode('utf-8')
+        records += _SNAPSHOT_RECORD.pack(len(ids), len(encoded), *_profile_fields(profile))
+        ids += encoded
+        count += 1
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, count, wal_segment, len(ids)))
+        f.write(records)
+        f.write(ids)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(path) or '.')
+    return count
+
+
+def read_snapshot(path):
+    """Return (wal_segment, [(customer_id, profile), ...]) from a memory-mapped snapshot"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            magic, count, wal_segment, ids_size = _SNAPSHOT_HEADER.unpack_from(view, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f'{path} is not a state snapshot')
+            records_start = _SNAPSHOT_HEADER.size
+            ids_start = records_start + count * _SNAPSHOT_RECORD.size
+            if len(view) != ids_start + ids_size:
+                raise ValueError(f'{path} is truncated')
+
+            ids = view[ids_start:]
+            items = []
+            records = memoryview(view)[records_start:ids_start]
+            try:
+                for offset, length, *fields in _SNAPSHOT_RECORD.iter_unpack(records):
+                    items.append((ids[offset:offset + length].decode('utf-8'), CustomerProfile(*fields)))
+            finally:
+                records.release()
+            return wal_segment, items
+
+
+def _segment_path(directory, segment):
+    return os.path.join(directory, f'wal-{segment:06d}.log')
+
+
+def list_segments(directory):
+    segments = []
+    for name in os.listdir(directory):
+        match = _WAL_SEGMENT.match(name)
+        if match:
+            segments.append(int(match.group(1)))
+    return sorted(segments)
+
+
+def replay_segment(path, profiles):
+    """
+    Apply the entries of one WAL segment to a {customer_id: profile} dict.
+
+    Stops at the first torn or corrupt entry (the tail of an interrupted
+    batch) and returns the number of entries applied.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    position = 0
+    applied = 0
+    while position + _WAL_HEADER.size <= len(data):
+        crc, op, id_length = _WAL_HEADER.unpack_from(data, position)
+        body_start = position + _WAL_HEADER.size
+        end = body_start + id_length + (_WAL_PROFILE.size if op == _WAL_UPSERT else 0)
+        if end > len(data) or zlib.crc32(data[position + 4:end]) != crc:
+            break
+        customer_id = data[body_start:body_start + id_length].decode('utf-8')
+        if op == _WAL_UPSERT:
+            profiles[customer_id] = CustomerProfile(*_WAL_PROFILE.unpack_from(data, body_start + id_length))
+        elif op == _WAL_DELETE:
+            profiles.pop(customer_id, None)
+        else:
+            break
+        position = end
+        applied += 1
+    return applied
+
+
+class _Segment:
+    """An open WAL segment and the length of its fsynced, intact prefix"""
+
+    def __init__(self, directory, number):
+        self.number = number
+        self.file = open(_segment_path(directory, number), 'ab', buffering=0)
+        self.size = self.file.seek(0, os.SEEK_END)
+        self.torn = False
+
+    def append(self, entries):
+        """
+        Write and fsync entries. After a failed attempt the partial tail is
+        cut off first, so replay never stops early at it.
+        """
+        if not entries:
+            return
+        fd = self.file.fileno()
+        if self.torn:
+            os.ftruncate(fd, self.size)
+        self.torn = True
+        data = memoryview(b''.join(entries))
+        written = len(data)
+        while data:
+            data = data[self.file.write(data):]
+        os.fsync(fd)
+        self.size += written
+        self.torn = False
+
+    def close(self):
+        self.file.close()
+
+
+class WriteAheadLog:
+    """Append-only, batch-flushed log of CustomerStateStore mutations"""
+
+    def __init__(self, directory, segment, batch_size=WAL_BATCH_SIZE):
+        self.directory = directory
+        self.batch_size = batch_size
+        self._current = _Segment(directory, segment)
+        self._pending = []
+        # (segment, entries) left behind by rotate(), oldest first
+        self._retired = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self.batch_ready = threading.Event()
+
+    @property
+    def segment(self):
+        return self._current.number
+
+    @property
+    def backlog(self):
+        """Entries buffered but not yet on disk"""
+        with self._lock:
+            return len(self._pending) + sum(len(entries) for _, entries in self._retired)
+
+    def _append(self, op, customer_id, payload=b''):
+        encoded = customer_id.encode('utf-8')
+        body = struct.pack('<BH', op, len(encoded)) + encoded + payload
+        entry = struct.pack('<I', zlib.crc32(body)) + body
+        with self._lock:
+            self._pending.append(entry)
+            if len(self._pending) >= self.batch_size:
+                self.batch_ready.set()
+
+    def upsert(self, customer_id, profile):
+        self._append(_WAL_UPSERT, customer_id, _WAL_PROFILE.pack(*_profile_fields(profile)))
+
+    def delete(self, customer_id):
+        self._append(_WAL_DELETE, customer_id)
+
+    def flush(self):
+        """
+        Write and fsync every buffered entry, finishing the segments retired
+        by rotate() first so entries stay in order.
+
+        On OSError the unwritten entries stay buffered in their segment and
+        the next flush() retries them.
+        """
+        with self._io_lock:
+            while True:
+                with self._lock:
+                    retired = bool(self._retired)
+                    if retired:
+                        segment, entries = self._retired[0]
+                    else:
+                        segment, entries = self._current, self._pending
+                        self._pending = []
+                        self.batch_ready.clear()
+                try:
+                    segment.append(entries)
+                except OSError:
+                    if not retired:
+                        self._requeue(segment, entries)
+                    raise
+                if not retired:
+                    return
+                with self._lock:
+                    self._retired.pop(0)
+                segment.close()
+
+    def _requeue(self, segment, entries):
+        with self._lock:
+            if segment is self._current:
+                self._pending[:0] = entries
+            else:
+                # rotate() retired the segment while it was being written
+                for retired, waiting in self._retired:
+                    if retired is segment:
+                        waiting[:0] = entries
+
+    def rotate(self):
+        """
+        Start a new segment and return its number.
+
+        Only swaps the buffer and file handle, so it is cheap enough to run
+        under the store lock; the old segment's last batch is written by the
+        next flush().
+        """
+        segment = _Segment(self.directory, self.segment + 1)
+        with self._lock:
+            self._retired.append((self._current, self._pending))
+            self._pending = []
+            self._current = segment
+            return segment.number
+
+    def close(self):
+        self.flush()
+        self._current.close()
+
+
+class StatePersistence:
+    """
+    Snapshot + WAL persistence for a CustomerStateStore.
+
+    Call recover() before serving, then start(); close() on shutdown
+    writes a final snapshot.
+    """
+
+    def __init__(self, store, directory,
+                 snapshot_interval=SNAPSHOT_INTERVAL_SECONDS,
+                 flush_interval=WAL_FLUSH_INTERVAL_SECONDS):
+        self.store = store
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.flush_interval = flush_interval
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.wal = None
+        self._stop = threading.Event()
+        self._threads = []
+        self._snapshot_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def recover(self):
+        """Load the snapshot and replay newer WAL segments into the store"""
+        first_segment = 0
+        profiles = {}
+        if os.path.exists(self.snapshot_path):
+            first_segment, items = read_snapshot(self.snapshot_path)
+            profiles.update(items)
+
+        replayed = 0
+        for segment in list_segments(self.directory):
+            if segment >= first_segment:
+                replayed += replay_segment(_segment_path(self.directory, segment), profiles)
+
+        self.store.load(profiles.items())
+        print(f"💾 Recovered {len(profiles)} customer profiles ({replayed} WAL entries replayed)")
+        return len(profiles)
+
+    def start(self):
+        """Begin journaling into a fresh WAL segment and start the background threads"""
+        segments = list_segments(self.directory)
+        self.wal = WriteAheadLog(self.directory, segments[-1] + 1 if segments else 1)
+        self.store.attach_journal(self.wal)
+        for target in (self._flush_loop, self._snapshot_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self.wal.batch_ready.wait(self.flush_interval)
+            try:
+                self.wal.flush()
+            except OSError as e:
+                print(f"❌ WAL flush failed ({e}); {self.wal.backlog} entries buffered, retrying")
+                self._stop.wait(WAL_RETRY_SECONDS)
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.snapshot_interval):
+            try:
+                self.snapshot()
+            except OSError as e:
+                print(f"❌ Snapshot failed ({e}); WAL segments kept, retrying in {self.snapshot_interval:.0f}s")
+
+    def snapshot(self):
+        """Write a snapshot of the store and delete the WAL segments it covers"""
+        with self._snapshot_lock:
+            segment, items = self.store.checkpoint(self.wal.rotate)
+            self.wal.flush()
+            count = write_snapshot(self.snapshot_path, items, segment)
+            for old in list_segments(self.directory):
+                if old < segment:
+                    os.remove(_segment_path(self.directory, old))
+            return count
+
+    def close(self):
+        self._stop.set()
+        self.wal.batch_ready.set()
+        for thread in self._threads:
+            thread.join()
+        self.snapshot()
+        self.store.attach_journal(None)
+        self.wal.close()
@@ -0,0 +1,79 @@
+"""
+Train the fraud model from the labeled CSVs in "Data Sample".
+
+Encodes the transactions with the same FeatureEncoder the server uses,
+fits a HistGradientBoostingClassifier on all but a random --holdout share
+of the rows, compiles it into a TreeEnsemble and writes model + encoder to
+--output for `server.py --model-dir`. The held-out rows are written next to
+them as holdout.csv, which `evaluate.py --model-dir` scores by default so
+its numbers are out of sample.
+
+Usage:
+    python train.py "../Data Sample/fraud_transactions.csv" "../Data Sample/fraud_transactions1.csv"
+"""
+import argparse
+import os
+from types import SimpleNamespace
+
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from datasets import load_labeled_csv, write_labeled_csv
+from evaluate import pr_auc, roc_auc, threshold_sweep
+from features import FeatureEncoder
+from fraud_model import HOLDOUT_FILE, FraudModel
+from tree_ensemble import TreeEnsemble
+
+
+def concat_columns(tables):
+    names = vars(tables[0][0])
+    columns = SimpleNamespace(**{name: np.concatenate([getattr(c, name) for c, _ in tables]) for name in names})
+    labels = {name: np.concatenate([labels[name] for _, labels in tables]) for name in tables[0][1]}
+    return columns, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the fraud detection model')
+    parser.add_argument('csv', nargs='+', help='Labeled transactions CSVs')
+    parser.add_argument('--output', default='model', help='Directory for fraud_model.npz and fraud_encoder.json')
+    parser.add_argument('--max-iter', type=int, default=100)
+    parser.add_argument('--max-depth', type=int, default=6)
+    parser.add_argument('--learning-rate', type=float, default=0.1)
+    parser.add_argument('--holdout', type=float, default=0.2, help='Fraction of rows kept out of training for evaluation')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        columns, labels = concat_columns([load_labeled_csv(path) for path in args.csv])
+    except ValueError as e:
+        parser.error(str(e))
+    is_fraud = labels['is_fraud']
+    encoder = FeatureEncoder()
+    X = encoder.encode_batch(columns)
+    print(f"📂 Loaded {len(is_fraud)} transactions ({int(is_fraud.sum())} fraud), {encoder.n_features} features")
+
+    order = np.random.default_rng(args.seed).permutation(len(is_fraud))
+    split = int(len(is_fraud) * (1 - args.holdout))
+    train, holdout = np.sort(order[:split]), np.sort(order[split:])
+
+    classifier = HistGradientBoostingClassifier(
+        max_iter=args.max_iter,
+        max_depth=args.max_depth,
+        learning_rate=args.learning_rate,
+        random_state=args.seed
+    )
+    classifier.fit(X[train], is_fraud[train])
+
+    model = FraudModel(encoder, TreeEnsemble.from_sklearn(classifier))
+    model.save(args.output)
+    print(f"✅ Saved {model.ensemble.n_trees} trees and feature encoder to {args.output} ({len(train)} training rows)")
+
+    if len(holdout):
+        sweep = threshold_sweep(model.ensemble.predict_risk(X[holdout]), is_fraud[holdout])
+        print(f"🎯 Holdout ROC AUC: {roc_auc(sweep):.3f}   PR AUC: {pr_auc(sweep):.3f}")
+        path = os.path.join(args.output, HOLDOUT_FILE)
+        write_labeled_csv(path, columns, labels, holdout)
+        print(f"💾 {len(holdout)} held-out rows written to {path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Array-compiled inference for gradient-boosted tree ensembles.
+
+A trained binary classifier is flattened into parallel NumPy arrays (split
+feature, threshold, child pointers, leaf value, missing-value direction)
+covering every node of every tree. Scoring walks all trees for all rows
+together, one vectorized step per tree level, instead of calling into a
+general ML library per request. Leaves point to themselves, so rows that
+reach a leaf early simply stay there.
+
+Margins are bit-identical to the source model: inputs are cast to the
+dtype the source library compares in, leaf values carry the same shrinkage
+and trees are summed in the same order. Probabilities go through NumPy's
+exp rather than scipy's expit and may differ from predict_proba in the
+last bit.
+
+Supported sources: scikit-learn GradientBoostingClassifier and
+HistGradientBoostingClassifier (numerical splits, binary targets).
+"""
+import numpy as np
+
+_ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'missing_left', 'roots')
+
+
+def sigmoid(margin):
+    return 1.0 / (1.0 + np.exp(-margin))
+
+
+class TreeEnsemble:
+    def __init__(self, feature, threshold, left, right, value, missing_left, roots,
+                 base_score, max_depth, n_features, input_dtype='float64'):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.missing_left = np.asarray(missing_left, dtype=bool)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.base_score = float(base_score)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.input_dtype = np.dtype(input_dtype)
+        # Column 0 is the right child, column 1 the left, indexed by the split outcome
+        self._children = np.stack([self.right, self.left], axis=1)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def decision_function(self, X):
+        """Raw margin (log-odds) for each row of X"""
+        X = np.asarray(X, dtype=self.input_dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f'Expected {self.n_features} features, got {X.shape[1]}')
+
+        rows = np.arange(X.shape[0])[:, None]
+        has_missing = np.isnan(X).any()
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if has_missing:
+                go_left |= np.isnan(x) & self.missing_left[nodes]
+            nodes = self._children[nodes, go_left.view(np.int8)]
+
+        # Sequential (not pairwise) summation, matching the source model's stage order
+        leaves = np.concatenate([np.full((X.shape[0], 1), self.base_score), self.value[nodes]], axis=1)
+        return np.cumsum(leaves, axis=1)[:, -1]
+
+    def predict_risk(self, X):
+        """Fraud probability for each row of X"""
+        return sigmoid(self.decision_function(X))
+
+    def save(self, path):
+        """Write the compiled ensemble as an uncompressed .npz"""
+        np.savez(
+            path,
+            base_score=self.base_score,
+            max_depth=self.max_depth,
+            n_features=self.n_features,
+            input_dtype=self.input_dtype.str,
+            **{name: getattr(self, name) for name in _ARRAYS}
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                base_score=data['base_score'][()],
+                max_depth=data['max_depth'][()],
+                n_features=data['n_features'][()],
+                input_dtype=str(data['input_dtype'][()]),
+                **{name: data[name] for name in _ARRAYS}
+            )
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Compile a fitted scikit-learn gradient-boosting classifier"""
+        if hasattr(model, '_predictors'):
+            return cls._from_hist_gradient_boosting(model)
+        if hasattr(model, 'estimators_'):
+            return cls._from_gradient_boosting(model)
+        raise ValueError(f'Unsupported model type: {type(model).__name__}')
+
+    @classmethod
+    def _from_gradient_boosting(cls, model):
+        if model.estimators_.shape[1] != 1:
+            raise ValueError('Only binary classifiers are supported')
+
+        builder = _Builder()
+        for estimator in model.estimators_[:, 0]:
+            tree = estimator.tree_
+            missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+            builder.add_tree(
+                feature=tree.feature,
+                threshold=tree.threshold,
+                left=tree.children_left,
+                right=tree.children_right,
+                # GradientBoosting adds learning_rate * tree output per stage
+                value=model.learning_rate * tree.value[:, 0, 0],
+                missing_left=missing_left,
+                is_leaf=tree.children_left == -1,
+                depth=tree.max_depth,
+            )
+
+        base_score = model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0]
+        # sklearn's DecisionTreeRegressor compares float32 inputs
+        return builder.build(base_score, model.n_features_in_, input_dtype='float32')
+
+    @classmethod
+    def _from_hist_gradient_boosting(cls, model):
+        if model.n_trees_per_iteration_ != 1:
+            raise ValueError('Only binary classifiers are supported')
+
+        builder = _Builder()
+        for (predictor,) in model._predictors:
+            nodes = predictor.nodes
+            if nodes['is_categorical'].any():
+                raise ValueError('Categorical splits are not supported; encode categoricals numerically')
+            builder.add_tree(
+                feature=nodes['feature_idx'],
+                threshold=nodes['num_threshold'],
+                left=nodes['left'],
+                right=nodes['right'],
+                # Hist predictors store leaf values with shrinkage applied
+                value=nodes['value'],
+                missing_left=nodes['missing_go_to_left'].astype(bool),
+                is_leaf=nodes['is_leaf'].astype(bool),
+                depth=int(nodes['depth'].max()),
+            )
+
+        base_score = np.asarray(model._baseline_prediction).ravel()[0]
+        return builder.build(base_score, model.n_features_in_, input_dtype='float64')
+
+
+class _Builder:
+    """Concatenates per-tree node arrays into one global node table"""
+
+    def __init__(self):
+        self.parts = {name: [] for name in _ARRAYS if name != 'roots'}
+        self.roots = []
+        self.size = 0
+        self.max_depth = 0
+
+    def add_tree(self, feature, threshold, left, right, value, missing_left, is_leaf, depth):
+        offset = self.size
+        local = np.arange(len(is_leaf))
+        self.parts['feature'].append(np.where(is_leaf, 0, feature))
+        self.parts['threshold'].append(np.where(is_leaf, 0.0, threshold))
+        self.parts['left'].append(offset + np.where(is_leaf, local, left))
+        self.parts['right'].append(offset + np.where(is_leaf, local, right))
+        self.parts['value'].append(np.where(is_leaf, value, 0.0))
+        self.parts['missing_left'].append(np.where(is_leaf, False, missing_left))
+        self.roots.append(offset)
+        self.size += len(is_leaf)
+        self.max_depth = max(self.max_depth, depth)
+
+    def build(self, base_score, n_features, input_dtype):
+        arrays = {name: np.concatenate(parts) for name, parts in self.parts.items()}
+        return TreeEnsemble(
+            roots=self.roots,
+            base_score=base_score,
+            max_depth=self.max_depth,
+            n_features=n_features,
+            input_dtype=input_dtype,
+            **arrays
+        )
+
+
+if __name__ == '__main__':
+    import argparse
+    import joblib
+
+    parser = argparse.ArgumentParser(description='Compile a pickled scikit-learn model to a TreeEnsemble file')
+    parser.add_argument('model', help='joblib pickle of a fitted gradient-boosting classifier')
+    parser.add_argument('output', help='Destination .npz file')
+    args = parser.parse_args()
+
+    ensemble = TreeEnsemble.from_sklearn(joblib.load(args.model))
+    ensemble.save(args.output)
+    print(f"✅ Compiled {ensemble.n_trees} trees ({len(ensemble.feature)} nodes) to {args.output}")